@@ -1,15 +1,38 @@
-import typing
+# typing.TYPE_CHECKING without importing typing at runtime
+TYPE_CHECKING = False
+
+if TYPE_CHECKING:
+    from typing import Any, Dict, Optional, Tuple, Type
 
-if typing.TYPE_CHECKING:
     from .lexer import LexToken, Location
 
+    #: What CxxParseError.__reduce__ returns
+    _Reduced = Tuple[
+        Type["CxxParseError"],
+        Tuple[str, Optional[LexToken], Optional[Location]],
+        Dict[str, Any],
+    ]
+
 
 class CxxParseError(Exception):
     """
     Exception raised when a parsing error occurs
     """
 
-    def __init__(self, msg: str, tok: typing.Optional["LexToken"] = None, location: typing.Optional["Location"] = None) -> None:
-        Exception.__init__(self, msg)
+    __slots__ = ("tok", "location")
+
+    def __init__(
+        self,
+        msg: str,
+        tok: "Optional[LexToken]" = None,
+        location: "Optional[Location]" = None,
+    ) -> None:
+        self.args = (msg,)
         self.tok = tok
         self.location = location
+
+    def __reduce__(self) -> "_Reduced":
+        # tok/location are slots, which BaseException.__reduce__ doesn't save.
+        # args is restored from the state so that it round trips as-is
+        state = dict(self.__dict__, args=self.args)
+        return (type(self), ("", self.tok, self.location), state)
@@ -4,9 +4,10 @@
 from __future__ import print_function
 
 from os.path import dirname, exists, join
-import sys, subprocess
+import os, sys, subprocess
 
 from setuptools import find_packages, setup
+from setuptools.command.build_ext import build_ext
 
 setup_dir = dirname(__file__)
 git_dir = join(setup_dir, ".git")
@@ -38,6 +39,66 @@ if exists(git_dir):
 with open(version_file, "r") as fp:
     exec(fp.read(), globals())
 
+# Optionally compile selected modules with Cython. The pure python sources are
+# always installed, so if the extension isn't built everything still works.
+# - CXXHEADERPARSER_CYTHON=0: never build
+# - CXXHEADERPARSER_CYTHON=1: always build, fail if it can't be built
+# - unset: build if Cython and a compiler are available
+cython_mode = os.environ.get("CXXHEADERPARSER_CYTHON")
+ext_modules = []
+
+if cython_mode != "0":
+    try:
+        from Cython.Build import cythonize
+    except ImportError:
+        if cython_mode == "1":
+            raise
+    else:
+        ext_modules = cythonize(
+            "cxxheaderparser/errors.py",
+            compiler_directives={"language_level": 3},
+        )
+
+
+class optional_build_ext(build_ext):
+    """
+    Skips extensions that fail to compile, unless CXXHEADERPARSER_CYTHON=1
+    """
+
+    def initialize_options(self):
+        build_ext.initialize_options(self)
+        self.failed_extensions = []
+
+    def build_extension(self, ext):
+        try:
+            build_ext.build_extension(self, ext)
+        except Exception as e:
+            if cython_mode == "1":
+                raise
+            print("Warning: not building %s: %s" % (ext.name, e))
+            self.failed_extensions.append(ext)
+
+    def _built_extensions(self):
+        return [ext for ext in self.extensions if ext not in self.failed_extensions]
+
+    def copy_extensions_to_source(self):
+        # don't try to copy extensions that weren't built for --inplace
+        extensions = self.extensions
+        self.extensions = self._built_extensions()
+        try:
+            build_ext.copy_extensions_to_source(self)
+        finally:
+            self.extensions = extensions
+
+    def get_outputs(self):
+        extensions = self.extensions
+        self.extensions = self._built_extensions()
+        try:
+            return build_ext.get_outputs(self)
+        finally:
+            self.extensions = extensions
+
+
 DESCRIPTION = (
     "Parse C++ header files and generate a data structure representing the class"
 )
@@ -72,6 +133,8 @@ setup(
     license="BSD",
     platforms="Platform Independent",
     packages=find_packages(),
+    ext_modules=ext_modules,
+    cmdclass={"build_ext": optional_build_ext},
     package_data={"cxxheaderparser": ["py.typed"]},
     keywords="c++ header parser ply",
     python_requires=">= 3.6",
@@ -0,0 +1,46 @@
+"""
+Shared helpers for the __hrefl tests
+"""
+
+import pytest
+from cxxheaderparser.parser import CxxParser
+from cxxheaderparser.visitor import CxxVisitor
+
+
+class HReflTestVisitor(CxxVisitor):
+    """Visitor that collects parsed declarations for testing"""
+
+    def __init__(self):
+        self.classes = []
+        self.enums = []
+        self.functions = []
+        self.fields = []
+        self.variables = []
+
+    def on_class_start(self, state):
+        self.classes.append(state.class_decl)
+        return True
+
+    def on_enum(self, state, enum):
+        self.enums.append(enum)
+
+    def on_function(self, state, fn):
+        self.functions.append(fn)
+
+    def on_class_field(self, state, field):
+        self.fields.append(field)
+
+    def on_variable(self, state, var):
+        self.variables.append(var)
+
+
+@pytest.fixture(scope="module")
+def run_parse():
+    """Returns a function that parses content and returns the visitor"""
+
+    def _parse(content):
+        visitor = HReflTestVisitor()
+        CxxParser("test.h", content, visitor).parse()
+        return visitor
+
+    return _parse
@@ -1,6 +1,10 @@
 # Note: testcases generated via `python -m cxxheaderparser.gentest`
 
+import copy
+import pickle
+
 from cxxheaderparser.errors import CxxParseError
+from cxxheaderparser.lexer import LexError, Location
 from cxxheaderparser.types import (
     BaseClass,
     ClassDecl,
@@ -109,6 +113,34 @@ def test_line_and_define() -> None:
     assert "filename.h:41" in str(e.value)
 
 
+@pytest.mark.parametrize("cls", [CxxParseError, LexError])
+@pytest.mark.parametrize(
+    "roundtrip",
+    [lambda e: pickle.loads(pickle.dumps(e)), copy.copy, copy.deepcopy],
+    ids=["pickle", "copy", "deepcopy"],
+)
+def test_parse_error_roundtrip(cls, roundtrip) -> None:
+    loc = Location("filename.h", 1)
+    orig = cls("message", "TOK", loc)
+    orig.extra = "extra"  # type: ignore[attr-defined]
+    if hasattr(orig, "add_note"):
+        orig.add_note("note")
+
+    e = roundtrip(orig)
+
+    assert type(e) is cls
+    assert e.args == ("message",)
+    assert e.tok == "TOK"
+    assert e.location == loc
+    assert e.extra == "extra"  # type: ignore[attr-defined]
+    if hasattr(orig, "add_note"):
+        assert e.__notes__ == ["note"]  # type: ignore[attr-defined]
+
+    # reassigned args are kept as-is
+    orig.args = ()
+    assert roundtrip(orig).args == ()
+
+
 #
 # extern "C"
 #